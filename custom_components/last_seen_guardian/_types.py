@@ -0,0 +1,16 @@
+"""Shared typing helpers for Last Seen Guardian."""
+from __future__ import annotations
+
+from typing import Protocol
+
+
+class LSGComponent(Protocol):
+    """Protocol for components owned by the integration.
+
+    Every component stored in hass.data (storage, registry, evaluator,
+    notifier) implements async_unload, so cleanup code can call it
+    unconditionally instead of probing with hasattr.
+    """
+
+    async def async_unload(self) -> None:
+        """Release subscriptions and resources."""
@@ -15,6 +15,47 @@ from .const import DOMAIN, DEFAULT_CHECK_INTERVAL, DEFAULT_THRESHOLD_MULTIPLIER
 
 _LOGGER = logging.getLogger(__name__)
 
+# Schemas are static: build them once at import instead of on every
+# form render (voluptuous Schema construction compiles validators)
+_USER_SCHEMA = vol.Schema({
+    vol.Optional(
+        "check_every_minutes",
+        default=DEFAULT_CHECK_INTERVAL
+    ): vol.All(vol.Coerce(int), vol.Range(min=5, max=120)),
+    vol.Optional(
+        "alert_threshold_multiplier",
+        default=DEFAULT_THRESHOLD_MULTIPLIER
+    ): vol.All(vol.Coerce(float), vol.Range(min=1.5, max=10.0)),
+    vol.Optional(
+        "enable_notifications",
+        default=True
+    ): cv.boolean,
+})
+
+_USER_PLACEHOLDERS = {
+    "default_interval": str(DEFAULT_CHECK_INTERVAL),
+    "default_multiplier": str(DEFAULT_THRESHOLD_MULTIPLIER),
+}
+
+_OPTIONS_SCHEMA = vol.Schema({
+    vol.Optional(
+        "check_every_minutes",
+        default=DEFAULT_CHECK_INTERVAL
+    ): vol.All(vol.Coerce(int), vol.Range(min=5, max=120)),
+    vol.Optional(
+        "alert_threshold_multiplier",
+        default=DEFAULT_THRESHOLD_MULTIPLIER
+    ): vol.All(vol.Coerce(float), vol.Range(min=1.5, max=10.0)),
+    vol.Optional(
+        "enable_notifications",
+        default=True
+    ): cv.boolean,
+    vol.Optional(
+        "notify_target",
+        default="notify.notify"
+    ): cv.string,
+})
+
 
 class LSGConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
     """Handle a config flow for Last Seen Guardian."""
@@ -39,29 +80,11 @@ class LSGConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
             )
 
         # Show form
-        data_schema = vol.Schema({
-            vol.Optional(
-                "check_every_minutes",
-                default=DEFAULT_CHECK_INTERVAL
-            ): vol.All(vol.Coerce(int), vol.Range(min=5, max=120)),
-            vol.Optional(
-                "alert_threshold_multiplier",
-                default=DEFAULT_THRESHOLD_MULTIPLIER
-            ): vol.All(vol.Coerce(float), vol.Range(min=1.5, max=10.0)),
-            vol.Optional(
-                "enable_notifications",
-                default=True
-            ): cv.boolean,
-        })
-
         return self.async_show_form(
             step_id="user",
-            data_schema=data_schema,
+            data_schema=_USER_SCHEMA,
             errors=errors,
-            description_placeholders={
-                "default_interval": str(DEFAULT_CHECK_INTERVAL),
-                "default_multiplier": str(DEFAULT_THRESHOLD_MULTIPLIER),
-            },
+            description_placeholders=_USER_PLACEHOLDERS,
         )
 
     @staticmethod
@@ -100,44 +123,24 @@ class LSGOptionsFlowHandler(config_entries.OptionsFlow):
             if not errors:
                 return self.async_create_entry(title="", data=user_input)
 
-        # Get current values
+        # Bind current values into the prebuilt schema instead of
+        # rebuilding it with per-render defaults
         current_data = {**self.config_entry.data, **self.config_entry.options}
-
-        options_schema = vol.Schema({
-            vol.Optional(
-                "check_every_minutes",
-                default=current_data.get("check_every_minutes", DEFAULT_CHECK_INTERVAL)
-            ): vol.All(vol.Coerce(int), vol.Range(min=5, max=120)),
-            vol.Optional(
-                "alert_threshold_multiplier",
-                default=current_data.get(
-                    "alert_threshold_multiplier",
-                    DEFAULT_THRESHOLD_MULTIPLIER
-                )
-            ): vol.All(vol.Coerce(float), vol.Range(min=1.5, max=10.0)),
-            vol.Optional(
-                "enable_notifications",
-                default=current_data.get("enable_notifications", True)
-            ): cv.boolean,
-            vol.Optional(
-                "notify_target",
-                default=current_data.get("notify_target", "notify.notify")
-            ): cv.string,
-        })
+        current_interval = current_data.get(
+            "check_every_minutes", DEFAULT_CHECK_INTERVAL
+        )
+        current_multiplier = current_data.get(
+            "alert_threshold_multiplier", DEFAULT_THRESHOLD_MULTIPLIER
+        )
 
         return self.async_show_form(
             step_id="init",
-            data_schema=options_schema,
+            data_schema=self.add_suggested_values_to_schema(
+                _OPTIONS_SCHEMA, current_data
+            ),
             errors=errors,
             description_placeholders={
-                "current_interval": str(
-                    current_data.get("check_every_minutes", DEFAULT_CHECK_INTERVAL)
-                ),
-                "current_multiplier": str(
-                    current_data.get(
-                        "alert_threshold_multiplier",
-                        DEFAULT_THRESHOLD_MULTIPLIER
-                    )
-                ),
+                "current_interval": str(current_interval),
+                "current_multiplier": str(current_multiplier),
             },
         )
\ No newline at end of file
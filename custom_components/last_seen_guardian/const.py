@@ -1,4 +1,6 @@
 """Constants for Last Seen Guardian."""
+from types import MappingProxyType
+from typing import NamedTuple
 
 DOMAIN = "last_seen_guardian"
 
@@ -21,34 +23,49 @@ HEALTH_LATE = "late"
 HEALTH_STALE = "stale"
 HEALTH_UNKNOWN = "unknown"
 
-# HA Areas & Tags
-LSG_LABELS = ["zigbee", "wifi", "ble", "critical"]
-LSG_TAGS = ["door", "humidity", "soil_moisture", "water_leak"]
+# HA Areas & Tags (frozensets: membership-tested in the per-entity hot loop)
+LSG_LABELS = frozenset(("zigbee", "wifi", "ble", "critical"))
+LSG_TAGS = frozenset(("door", "humidity", "soil_moisture", "water_leak"))
 
 # Operation Modes
-LSG_MODES = ["normal", "vacation", "night"]
+LSG_MODES = frozenset(("normal", "vacation", "night"))
 
 # Mode configurations - SAFE DEFAULTS
-MODE_CONFIGS = {
-    "normal": {
-        "threshold_multiplier": 5.0,  # INCREASED FROM 2.5
-        "alert_enabled": False,  # DISABLED BY DEFAULT
-        "ignore_variable": False,
-        "silent_alerts": False,
-    },
-    "vacation": {
-        "threshold_multiplier": 8.0,  # INCREASED FROM 4.0
-        "alert_enabled": False,
-        "ignore_variable": True,
-        "silent_alerts": False,
-    },
-    "night": {
-        "threshold_multiplier": 4.0,  # INCREASED FROM 2.0
-        "alert_enabled": False,  # DISABLED BY DEFAULT
-        "ignore_variable": False,
-        "silent_alerts": True,
-    },
-}
+# Immutable named tuples: looked up on every evaluator tick and shared
+# across components, so accidental mutation must not be possible and
+# field access stays a C-level attribute read (use ._asdict() where a
+# plain dict payload is needed).
+
+
+class ModeConfig(NamedTuple):
+    """Per-mode tuning values."""
+
+    threshold_multiplier: float
+    alert_enabled: bool
+    ignore_variable: bool
+    silent_alerts: bool
+
+
+MODE_CONFIGS = MappingProxyType({
+    "normal": ModeConfig(
+        threshold_multiplier=5.0,  # INCREASED FROM 2.5
+        alert_enabled=False,  # DISABLED BY DEFAULT
+        ignore_variable=False,
+        silent_alerts=False,
+    ),
+    "vacation": ModeConfig(
+        threshold_multiplier=8.0,  # INCREASED FROM 4.0
+        alert_enabled=False,
+        ignore_variable=True,
+        silent_alerts=False,
+    ),
+    "night": ModeConfig(
+        threshold_multiplier=4.0,  # INCREASED FROM 2.0
+        alert_enabled=False,  # DISABLED BY DEFAULT
+        ignore_variable=False,
+        silent_alerts=True,
+    ),
+})
 
 # Platforms
 PLATFORMS = ["sensor"]
@@ -75,10 +92,10 @@ NOTIFICATION_COOLDOWN_SECONDS = 300  # 5 minutes - INCREASED
 # Battery monitoring (v0.7)
 BATTERY_LOW_THRESHOLD = 15  # percent - REDUCED to alert only critical
 BATTERY_CRITICAL_THRESHOLD = 5  # percent
-BATTERY_DOMAINS = ["sensor"]
+BATTERY_DOMAINS = frozenset(("sensor",))
 
 # Signal quality (v0.7)
-LQI_DOMAINS = ["sensor", "binary_sensor"]
+LQI_DOMAINS = frozenset(("sensor", "binary_sensor"))
 LQI_LOW_THRESHOLD = 50  # REDUCED - only alert very poor signal
 RSSI_LOW_THRESHOLD = -90  # REDUCED - only alert very poor signal
 
@@ -4,11 +4,16 @@ Validates and cleans learning state to prevent unbounded growth.
 """
 from __future__ import annotations
 
+import heapq
 import logging
 import time
-from typing import Dict, Any, Tuple, List
+from typing import Dict, Any, Iterable, Tuple
 
 from .const import (
+    HEALTH_OK,
+    HEALTH_LATE,
+    HEALTH_STALE,
+    HEALTH_UNKNOWN,
     MAX_LEARNING_STATE_SIZE,
     MAX_HISTORY_PER_ENTITY,
     MAX_HISTORY_AGE_DAYS,
@@ -16,29 +21,79 @@ from .const import (
 
 _LOGGER = logging.getLogger(__name__)
 
+# Rough empirical per-item sizes used by get_data_stats; serializing the
+# whole learning state just to measure it would cost far more than the
+# estimate is worth
+_AVG_ENTITY_BYTES = 512
+_AVG_EVENT_BYTES = 128
+
+# Checked per entity on every validation pass
+_VALID_HEALTH_STATES = frozenset(
+    (HEALTH_OK, HEALTH_LATE, HEALTH_STALE, HEALTH_UNKNOWN)
+)
+
+# Numeric global-config options: (name, coercion, lo, hi, default)
+_GLOBAL_NUMERIC_OPTIONS = (
+    ("check_every_minutes", int, 5, 120, 15),
+    ("alert_threshold_multiplier", float, 1.5, 10.0, 2.5),
+)
+
+# Numeric learning-state fields: (name, coercion, default on failure)
+_NUMERIC_FIELDS = (
+    ("last_event", float, None),
+    ("interval_ewma", float, None),
+    ("threshold", float, None),
+    ("interval_variance", float, None),
+    ("event_count", int, 0),
+)
+
+
+def _validate_numeric(value, caster, lo, hi, default):
+    """Coerce and range-check a numeric option.
+
+    Returns:
+        Tuple of (validated_value, failed) where failed indicates the
+        default was substituted.
+    """
+    try:
+        value = caster(value)
+    except (ValueError, TypeError):
+        return default, True
+    if value < lo or value > hi:
+        return default, True
+    return value, False
+
 
 class DataValidator:
     """Validates and cleans learning state data."""
     
     @staticmethod
     def validate_learning_state(
-        learning_state: Dict[str, Any]
+        learning_state: Dict[str, Any],
+        now: float | None = None
     ) -> Tuple[bool, str, Dict[str, Any]]:
         """
         Validate and clean learning state.
-        
+
         Args:
             learning_state: Dictionary of entity learning states
-        
+            now: Optional reference time (epoch seconds); callers running
+                several validation passes can share one clock read
+
         Returns:
             Tuple of (is_valid, message, cleaned_state)
+
+        Note:
+            The input dict is cleaned in place (invalid entries deleted,
+            histories trimmed) and returned as cleaned_state; a full copy
+            would double peak memory for states near the size cap.
         """
         if not isinstance(learning_state, dict):
             return False, "learning_state must be a dictionary", {}
-        
-        cleaned_state = {}
+
         issues = []
         entities_removed = 0
+        to_remove = []
         
         # Check size limit
         if len(learning_state) > MAX_LEARNING_STATE_SIZE:
@@ -48,53 +103,69 @@ class DataValidator:
                 MAX_LEARNING_STATE_SIZE
             )
             
-            # Sort by last_event and keep most recent
-            sorted_entities = sorted(
+            # Keep the most recent entries by last_event; nlargest is
+            # O(N log K) instead of sorting the whole dict
+            entities_removed = len(learning_state) - MAX_LEARNING_STATE_SIZE
+            top = heapq.nlargest(
+                MAX_LEARNING_STATE_SIZE,
                 learning_state.items(),
-                key=lambda x: x[1].get("last_event", 0),
-                reverse=True
+                key=lambda kv: kv[1].get("last_event", 0) or 0
             )
-            
-            learning_state = dict(sorted_entities[:MAX_LEARNING_STATE_SIZE])
-            entities_removed = len(sorted_entities) - MAX_LEARNING_STATE_SIZE
+            learning_state = {entity_id: state for entity_id, state in top}
             issues.append(f"Pruned {entities_removed} oldest entities")
         
         # Validate each entity
-        now = time.time()
-        max_age_seconds = MAX_HISTORY_AGE_DAYS * 86400
-        
+        if now is None:
+            now = time.time()
+        cutoff = now - MAX_HISTORY_AGE_DAYS * 86400
+        # Local bind: isinstance is called per event in the loop below
+        _isinstance = isinstance
+        # Checked once; the per-entity debug call below would otherwise
+        # dispatch through the logger even when DEBUG is filtered
+        _debug = _LOGGER.isEnabledFor(logging.DEBUG)
+
         for entity_id, state in learning_state.items():
-            if not isinstance(state, dict):
+            if not _isinstance(state, dict):
                 _LOGGER.warning("Invalid state for %s, skipping", entity_id)
+                to_remove.append(entity_id)
                 continue
-            
+
             # Validate required fields
-            required_fields = ["last_event", "event_count"]
-            if not all(field in state for field in required_fields):
+            if "last_event" not in state or "event_count" not in state:
                 _LOGGER.warning(
                     "Entity %s missing required fields, skipping",
                     entity_id
                 )
+                to_remove.append(entity_id)
                 continue
             
-            # Clean history
-            if "history" in state and isinstance(state["history"], list):
+            # Clean history in one reverse walk: histories are
+            # append-ordered, so once an event falls past the age cutoff
+            # (or we have MAX_HISTORY_PER_ENTITY recent ones) we can stop
+            if "history" in state and _isinstance(state["history"], list):
                 original_count = len(state["history"])
-                
-                # Remove old events
-                state["history"] = [
-                    event for event in state["history"]
-                    if isinstance(event, dict) 
-                    and event.get("timestamp", 0) > (now - max_age_seconds)
-                ]
-                
-                # Limit history size
-                if len(state["history"]) > MAX_HISTORY_PER_ENTITY:
-                    state["history"] = state["history"][-MAX_HISTORY_PER_ENTITY:]
-                
-                cleaned_count = len(state["history"])
-                
-                if original_count != cleaned_count:
+
+                kept = []
+                for event in reversed(state["history"]):
+                    # EAFP: events are dicts with timestamps except on
+                    # corrupted data, so probe directly instead of
+                    # type-checking every iteration
+                    try:
+                        if event["timestamp"] <= cutoff:
+                            break
+                    except KeyError:
+                        break  # no timestamp: same as timestamp 0, expired
+                    except TypeError:
+                        continue  # corrupted non-dict entry, drop it
+                    kept.append(event)
+                    if len(kept) == MAX_HISTORY_PER_ENTITY:
+                        break
+                kept.reverse()
+                state["history"] = kept
+
+                cleaned_count = len(kept)
+
+                if _debug and original_count != cleaned_count:
                     _LOGGER.debug(
                         "Cleaned history for %s: %d -> %d events",
                         entity_id,
@@ -102,44 +173,36 @@ class DataValidator:
                         cleaned_count
                     )
             
-            # Validate numeric fields
-            for field in ["last_event", "interval_ewma", "threshold", "interval_variance"]:
-                if field in state:
-                    try:
-                        if field == "event_count":
-                            state[field] = int(state[field])
-                        else:
-                            state[field] = float(state[field])
-                    except (ValueError, TypeError):
-                        _LOGGER.warning(
-                            "Invalid %s for %s, setting to default",
-                            field,
-                            entity_id
-                        )
-                        if field == "event_count":
-                            state[field] = 0
-                        else:
-                            state[field] = None
-            
-            # Validate event_count
-            if "event_count" in state:
+            # Validate numeric fields via the coercion table; the type
+            # pre-check skips the try/except for already-correct values,
+            # which is the overwhelmingly common case
+            for field, coerce, default in _NUMERIC_FIELDS:
+                value = state.get(field)
+                if value is None or type(value) is coerce:
+                    continue
                 try:
-                    state["event_count"] = int(state["event_count"])
-                    if state["event_count"] < 0:
-                        state["event_count"] = 0
+                    state[field] = coerce(value)
                 except (ValueError, TypeError):
-                    state["event_count"] = 0
+                    _LOGGER.warning(
+                        "Invalid %s for %s, setting to default",
+                        field,
+                        entity_id
+                    )
+                    state[field] = default
+
+            # event_count must end up a non-negative int
+            if not _isinstance(state["event_count"], int) or state["event_count"] < 0:
+                state["event_count"] = 0
             
             # Validate health state
-            valid_health_states = ["ok", "late", "stale", "unknown"]
             if "last_health" in state:
-                if state["last_health"] not in valid_health_states:
+                if state["last_health"] not in _VALID_HEALTH_STATES:
                     _LOGGER.warning(
                         "Invalid health state '%s' for %s, setting to 'unknown'",
                         state["last_health"],
                         entity_id
                     )
-                    state["last_health"] = "unknown"
+                    state["last_health"] = HEALTH_UNKNOWN
             
             # Ensure technical_context is a dict
             if "technical_context" in state:
@@ -151,20 +214,21 @@ class DataValidator:
                     state["technical_context"] = {}
             else:
                 state["technical_context"] = {}
-            
-            cleaned_state[entity_id] = state
-        
+
+        for entity_id in to_remove:
+            del learning_state[entity_id]
+
         message = "Learning state validated"
         if issues:
             message += f": {', '.join(issues)}"
         
         _LOGGER.info(
             "Validation complete: %d entities valid, %d removed",
-            len(cleaned_state),
+            len(learning_state),
             entities_removed
         )
-        
-        return True, message, cleaned_state
+
+        return True, message, learning_state
     
     @staticmethod
     def get_data_stats(learning_state: Dict[str, Any]) -> Dict[str, Any]:
@@ -188,39 +252,39 @@ class DataValidator:
                 "total_size_estimate_kb": 0.0,
             }
         
-        total_events = sum(
-            state.get("event_count", 0) 
-            for state in learning_state.values()
-        )
-        
-        total_history = sum(
-            len(state.get("history", [])) 
-            for state in learning_state.values()
-        )
-        
-        all_timestamps = [
-            state.get("last_event")
-            for state in learning_state.values()
-            if state.get("last_event")
-        ]
-        
-        # Estimate size in KB (rough approximation)
-        import sys
-        try:
-            size_bytes = sys.getsizeof(str(learning_state))
-            size_kb = size_bytes / 1024
-        except:
-            size_kb = 0.0
-        
+        # Single pass over the values: running totals and min/max instead
+        # of four separate traversals plus a timestamp list
+        total_events = 0
+        total_history = 0
+        oldest_event = None
+        newest_event = None
+
+        for state in learning_state.values():
+            total_events += state.get("event_count", 0) or 0
+            history = state.get("history")
+            if isinstance(history, list):
+                total_history += len(history)
+            last_event = state.get("last_event")
+            if last_event:
+                if oldest_event is None or last_event < oldest_event:
+                    oldest_event = last_event
+                if newest_event is None or last_event > newest_event:
+                    newest_event = last_event
+
+        # Estimate size in KB from structure counts (rough approximation)
         entity_count = len(learning_state)
+        size_kb = (
+            entity_count * _AVG_ENTITY_BYTES + total_history * _AVG_EVENT_BYTES
+        ) / 1024
+
         avg_events = total_events / entity_count if entity_count > 0 else 0.0
         
         return {
             "entity_count": entity_count,
             "total_events": total_events,
             "total_history_items": total_history,
-            "oldest_event": min(all_timestamps) if all_timestamps else None,
-            "newest_event": max(all_timestamps) if all_timestamps else None,
+            "oldest_event": oldest_event,
+            "newest_event": newest_event,
             "avg_events_per_entity": round(avg_events, 2),
             "total_size_estimate_kb": round(size_kb, 2),
         }
@@ -228,29 +292,31 @@ class DataValidator:
     @staticmethod
     def cleanup_orphaned_entities(
         learning_state: Dict[str, Any],
-        valid_entity_ids: List[str]
+        valid_entity_ids: Iterable[str]
     ) -> Tuple[Dict[str, Any], int]:
         """
         Remove entities from learning state that no longer exist in HA.
-        
+
         Args:
             learning_state: Current learning state
-            valid_entity_ids: List of valid entity IDs from entity registry
-        
+            valid_entity_ids: Valid entity IDs from the entity registry;
+                sets are used as-is, other iterables are hashed once
+
         Returns:
             Tuple of (cleaned_state, removed_count)
         """
-        valid_set = set(valid_entity_ids)
-        cleaned_state = {}
-        removed_count = 0
-        
-        for entity_id, state in learning_state.items():
-            if entity_id in valid_set:
-                cleaned_state[entity_id] = state
-            else:
-                removed_count += 1
-                _LOGGER.debug("Removing orphaned entity: %s", entity_id)
-        
+        if isinstance(valid_entity_ids, (set, frozenset)):
+            valid_set = valid_entity_ids
+        else:
+            valid_set = frozenset(valid_entity_ids)
+
+        cleaned_state = {
+            entity_id: state
+            for entity_id, state in learning_state.items()
+            if entity_id in valid_set
+        }
+        removed_count = len(learning_state) - len(cleaned_state)
+
         if removed_count > 0:
             _LOGGER.info("Removed %d orphaned entities", removed_count)
         
@@ -260,7 +326,8 @@ class DataValidator:
     def compress_history(
         learning_state: Dict[str, Any],
         keep_last_n: int = 50,
-        compress_older_than_days: int = 7
+        compress_older_than_days: int = 7,
+        now: float | None = None
     ) -> Dict[str, Any]:
         """
         Compress old history events to save space.
@@ -272,11 +339,14 @@ class DataValidator:
             learning_state: Current learning state
             keep_last_n: Number of recent events to keep in full
             compress_older_than_days: Compress events older than this
-        
+            now: Optional reference time (epoch seconds) shared with
+                other validation passes in the same cycle
+
         Returns:
             Learning state with compressed history
         """
-        now = time.time()
+        if now is None:
+            now = time.time()
         cutoff_time = now - (compress_older_than_days * 86400)
         
         for entity_id, state in learning_state.items():
@@ -284,47 +354,70 @@ class DataValidator:
                 continue
             
             history = state["history"]
-            
-            # Separate recent and old events
+
+            # Fast path: histories are append-ordered (oldest first), so
+            # if the oldest event is already newer than the cutoff there
+            # is nothing to compress for this entity
+            if not history or (
+                isinstance(history[0], dict)
+                and history[0].get("timestamp", 0) > cutoff_time
+            ):
+                continue
+
+            # Split in one pass, reducing old events to running scalars
+            # instead of materializing old-event and interval lists
             recent_events = []
-            old_events = []
-            
+            old_count = 0
+            interval_count = 0
+            interval_sum = 0.0
+            min_interval = None
+            max_interval = None
+            oldest_timestamp = None
+            newest_timestamp = None
+
             for event in history:
                 if not isinstance(event, dict):
                     continue
-                    
+
                 timestamp = event.get("timestamp", 0)
                 if timestamp > cutoff_time:
                     recent_events.append(event)
-                else:
-                    old_events.append(event)
-            
+                    continue
+
+                old_count += 1
+                if oldest_timestamp is None or timestamp < oldest_timestamp:
+                    oldest_timestamp = timestamp
+                if newest_timestamp is None or timestamp > newest_timestamp:
+                    newest_timestamp = timestamp
+
+                if "interval" in event:
+                    interval = event["interval"]
+                    interval_count += 1
+                    interval_sum += interval
+                    if min_interval is None or interval < min_interval:
+                        min_interval = interval
+                    if max_interval is None or interval > max_interval:
+                        max_interval = interval
+
             # Keep last N recent events
             recent_events = recent_events[-keep_last_n:]
-            
+
             # Compress old events into summary
-            if old_events:
-                old_intervals = [
-                    e.get("interval", 0) 
-                    for e in old_events 
-                    if "interval" in e
-                ]
-                
-                if old_intervals:
-                    compressed_summary = {
-                        "compressed": True,
-                        "event_count": len(old_events),
-                        "avg_interval": sum(old_intervals) / len(old_intervals),
-                        "min_interval": min(old_intervals),
-                        "max_interval": max(old_intervals),
-                        "oldest_timestamp": min(e.get("timestamp", 0) for e in old_events),
-                        "newest_timestamp": max(e.get("timestamp", 0) for e in old_events),
-                    }
-                    
-                    # Add compressed summary as first item
-                    state["history"] = [compressed_summary] + recent_events
-                else:
-                    state["history"] = recent_events
+            if old_count and interval_count:
+                compressed_summary = {
+                    "compressed": True,
+                    "event_count": old_count,
+                    "avg_interval": interval_sum / interval_count,
+                    "min_interval": min_interval,
+                    "max_interval": max_interval,
+                    "oldest_timestamp": oldest_timestamp,
+                    "newest_timestamp": newest_timestamp,
+                }
+
+                # Prepend the summary into the already-owned list instead
+                # of allocating a concatenation result
+                recent_events.insert(0, compressed_summary)
+                state["history"] = recent_events
             else:
                 state["history"] = recent_events
         
@@ -358,33 +451,18 @@ class DataValidator:
                 }
             else:
                 global_config = config["global"].copy()
-                
-                # Validate check_every_minutes
-                check_interval = global_config.get("check_every_minutes", 15)
-                try:
-                    check_interval = int(check_interval)
-                    if check_interval < 5 or check_interval > 120:
-                        issues.append("check_every_minutes out of range (5-120), using default")
-                        check_interval = 15
-                except (ValueError, TypeError):
-                    issues.append("Invalid check_every_minutes, using default")
-                    check_interval = 15
-                
-                global_config["check_every_minutes"] = check_interval
-                
-                # Validate threshold_multiplier
-                threshold = global_config.get("alert_threshold_multiplier", 2.5)
-                try:
-                    threshold = float(threshold)
-                    if threshold < 1.5 or threshold > 10.0:
-                        issues.append("alert_threshold_multiplier out of range (1.5-10.0), using default")
-                        threshold = 2.5
-                except (ValueError, TypeError):
-                    issues.append("Invalid alert_threshold_multiplier, using default")
-                    threshold = 2.5
-                
-                global_config["alert_threshold_multiplier"] = threshold
-                
+
+                # Validate numeric options against the declarative table
+                for key, caster, lo, hi, default in _GLOBAL_NUMERIC_OPTIONS:
+                    value, failed = _validate_numeric(
+                        global_config.get(key, default), caster, lo, hi, default
+                    )
+                    if failed:
+                        issues.append(
+                            f"{key} invalid or out of range ({lo}-{hi}), using default"
+                        )
+                    global_config[key] = value
+
                 # Validate enable_notifications
                 enable_notif = global_config.get("enable_notifications", True)
                 if not isinstance(enable_notif, bool):
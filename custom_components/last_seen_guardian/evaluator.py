@@ -2,12 +2,12 @@
 import asyncio
 import logging
 import time
-from typing import Dict, Optional, Set, Tuple
-from datetime import datetime, timedelta
+from collections import deque
+from dataclasses import dataclass, field
+from math import sqrt
+from typing import Callable, Deque, Dict, List, Optional, Set, Tuple
 from homeassistant.core import HomeAssistant, State, callback
 from homeassistant.const import EVENT_STATE_CHANGED
-from homeassistant.helpers.event import async_track_time_interval
-from homeassistant.helpers.entity_registry import async_get as async_get_entity_registry
 from .recorder import LSGRecorderIntegration
 
 from .const import (
@@ -31,23 +31,156 @@ _LOGGER = logging.getLogger(__name__)
 SAVE_DEBOUNCE_SECONDS = 30
 SAVE_MAX_WAIT_SECONDS = 300
 
+# Max history entries kept per entity (deque maxlen — O(1) bounded append)
+HISTORY_MAX_LEN = 100
+
+# Attribute names probed for technical context, in priority order
+_BATTERY_KEYS = ("battery_level", "battery", "battery_percent")
+_LQI_KEYS = ("lqi", "linkquality")
+_RSSI_KEYS = ("rssi", "signal_strength")
+
+
+@callback
+def _state_event_filter(event_data) -> bool:
+    """Pre-filter EVENT_STATE_CHANGED before a listener job is queued.
+
+    Runs in the bus dispatch path, so removals, startup noise and
+    unavailable/unknown transitions are rejected without ever invoking
+    the listener.
+    """
+    new_state = event_data.get("new_state")
+    return (
+        new_state is not None
+        and new_state.state not in ("unavailable", "unknown")
+        and bool(event_data.get("entity_id"))
+    )
+
+
+def _to_float(value) -> Optional[float]:
+    """Coerce an attribute value to float, fast-pathing numerics.
+
+    Attributes from zigbee2mqtt/HA integrations are usually already
+    numeric; isinstance avoids exception setup on that common case.
+    """
+    if isinstance(value, (int, float)):
+        return float(value)
+    if isinstance(value, str):
+        try:
+            return float(value)
+        except ValueError:
+            return None
+    return None
+
+
+def _to_int(value) -> Optional[int]:
+    """Coerce an attribute value to int, fast-pathing numerics."""
+    if isinstance(value, int):
+        return value
+    if isinstance(value, (float, str)):
+        try:
+            return int(value)
+        except ValueError:
+            return None
+    return None
+
+
+def _history_to_list(history) -> List[Dict]:
+    """Convert in-memory history tuples to the stored dict form."""
+    return [
+        {"timestamp": t, "interval": i, "state": s}
+        for t, i, s in history
+    ]
+
+
+def _history_to_deque(history) -> Deque[Tuple]:
+    """Convert stored history dicts to the in-memory tuple form."""
+    return deque(
+        (
+            (e["timestamp"], e.get("interval"), e.get("state"))
+            for e in history
+            if isinstance(e, dict) and "timestamp" in e
+        ),
+        maxlen=HISTORY_MAX_LEN,
+    )
+
+
+@dataclass(slots=True)
+class EntityLearning:
+    """Per-entity learning state.
+
+    Slotted attributes instead of a ~10-key dict: fixed-offset access
+    on the hot path and a fraction of the per-entity memory at scale.
+    The dict shape remains the storage schema — to_dict/from_dict
+    convert at the save/load boundary.
+    """
+
+    last_event: float
+    interval_ewma: Optional[float] = None
+    interval_variance: float = 0.0
+    event_count: int = 0
+    threshold: Optional[float] = None
+    last_health: str = HEALTH_UNKNOWN
+    history: Deque[Tuple] = field(default_factory=lambda: deque(maxlen=HISTORY_MAX_LEN))
+    technical_context: Dict = field(default_factory=dict)
+    # Transient: when the current health verdict expires (not persisted)
+    health_valid_until: Optional[float] = None
+
+    def to_dict(self) -> Dict:
+        """Serialize to the stored (JSON) schema."""
+        return {
+            "last_event": self.last_event,
+            "interval_ewma": self.interval_ewma,
+            "interval_variance": self.interval_variance,
+            "event_count": self.event_count,
+            "threshold": self.threshold,
+            "last_health": self.last_health,
+            "history": _history_to_list(self.history),
+            "technical_context": self.technical_context,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> "EntityLearning":
+        """Build from the stored (validated) dict schema."""
+        return cls(
+            last_event=data.get("last_event", 0.0),
+            interval_ewma=data.get("interval_ewma"),
+            interval_variance=data.get("interval_variance", 0.0),
+            event_count=data.get("event_count", 0),
+            threshold=data.get("threshold"),
+            last_health=data.get("last_health", HEALTH_UNKNOWN),
+            history=_history_to_deque(data.get("history") or []),
+            technical_context=data.get("technical_context") or {},
+        )
+
 
 class LSGEvaluator:
     """Evaluator with pattern learning, health monitoring, and technical context."""
     
     def __init__(self, hass: HomeAssistant):
         self._hass = hass
-        self._learning_state: Dict[str, Dict] = {}
+        self._learning_state: Dict[str, EntityLearning] = {}
+        # Secondary index: health status -> entity ids, kept in sync on
+        # every verdict change so consumers that only care about (say)
+        # STALE entities iterate O(alerting) instead of O(all)
+        self._by_health: Dict[str, Set[str]] = {}
+        # Callbacks fired on every health transition (push instead of
+        # making consumers poll for changes)
+        self._transition_listeners: List[Callable[[str, str, str], None]] = []
         self._unsubscribe = None
-        self._unsubscribe_timer = None
         self._storage = None
         
         # Debouncing state
         self._pending_save = False
-        self._save_task: Optional[asyncio.Task] = None
+        self._save_timer: Optional[asyncio.TimerHandle] = None
         self._last_save_time = 0
+        self._first_dirty_at: float = 0.0
         self._entities_changed: Set[str] = set()
         
+        # Cached mode config: refreshed on mode change instead of read
+        # from storage on every state-change event
+        self._current_mode = "normal"
+        self._threshold_multiplier: float = MODE_CONFIGS["normal"].threshold_multiplier
+
         # Health cache for performance (MEJORA #1)
         self._health_cache = HealthCache(ttl=60, max_size=1000)
         
@@ -55,124 +188,139 @@ class LSGEvaluator:
         self._recorder = LSGRecorderIntegration(hass)
 
     async def async_setup(self) -> None:
-        """Initialize evaluator and load learning state."""
+        """Initialize evaluator and load learning state.
+
+        Config is always read live through the storage layer's
+        in-memory view (refresh_mode_cache below), so no setup-time
+        snapshot is taken.
+        """
         self._storage = self._hass.data[DOMAIN].get("storage")
+        self.refresh_mode_cache()
         if self._storage:
             stored = await self._storage.async_get("learning_state")
             if stored:
-                # Validate and clean loaded state
-                is_valid, message, cleaned_state = DataValidator.validate_learning_state(stored)
+                # Validate and clean loaded state; the full pass is
+                # CPU-bound pure-dict work, keep it off the event loop
+                is_valid, message, cleaned_state = await self._hass.async_add_executor_job(
+                    DataValidator.validate_learning_state, stored
+                )
                 if is_valid:
-                    self._learning_state = cleaned_state
-                    _LOGGER.info("Loaded learning state for %d entities: %s", 
+                    self._learning_state = {
+                        entity_id: EntityLearning.from_dict(state)
+                        for entity_id, state in cleaned_state.items()
+                    }
+                    self._rebuild_health_index()
+                    _LOGGER.info("Loaded learning state for %d entities: %s",
                                 len(cleaned_state), message)
                 else:
                     _LOGGER.warning("Invalid learning state: %s", message)
         
-        # Subscribe to state changes
+        # Subscribe to state changes; irrelevant events are rejected by
+        # the bus-level filter, so the listener body stays minimal
         @callback
         def state_changed_listener(event):
-            """Handle state changes for tracked entities."""
-            entity_id = event.data.get("entity_id")
-            new_state = event.data.get("new_state")
-            
-            if new_state and entity_id:
-                self._hass.async_create_task(
-                    self._async_update_entity_learning(entity_id, new_state)
-                )
-        
+            """Run the (purely synchronous) learning update inline."""
+            self._update_entity_learning(
+                event.data["entity_id"], event.data["new_state"]
+            )
+
         self._unsubscribe = self._hass.bus.async_listen(
             EVENT_STATE_CHANGED,
-            state_changed_listener
-        )
-        
-        # Setup periodic forced save (every 5 minutes)
-        self._unsubscribe_timer = async_track_time_interval(
-            self._hass,
-            self._async_periodic_save,
-            timedelta(seconds=SAVE_MAX_WAIT_SECONDS)
+            state_changed_listener,
+            event_filter=_state_event_filter,
         )
         
         _LOGGER.info("Evaluator initialized with cache, debouncing, and technical monitoring")
     
-    async def _async_update_entity_learning(
-        self, entity_id: str, state: State
-    ) -> None:
-        # CRITICAL FIX: Ignore unavailable/unknown states during startup
-        if state.state in ("unavailable", "unknown"):
-            return
-    
-        """Update learning state when entity changes."""
+    @callback
+    def _update_entity_learning(self, entity_id: str, state: State) -> None:
+        """Update learning state when entity changes (pure dict math)."""
         now = time.time()
         
         # INVALIDATE CACHE WHEN ENTITY UPDATES (AQUÍ VA LA MODIFICACIÓN)
         self._health_cache.invalidate(entity_id)
         
         # Get or create learning state
-        if entity_id not in self._learning_state:
-            self._learning_state[entity_id] = {
-                "last_event": now,
-                "interval_ewma": None,
-                "interval_variance": 0.0,
-                "event_count": 0,
-                "threshold": None,
-                "last_health": HEALTH_UNKNOWN,
-                "history": [],
-                "technical_context": {}  # v0.7
-            }
-        
-        entity_state = self._learning_state[entity_id]
-        
+        entity_state = self._learning_state.get(entity_id)
+        if entity_state is None:
+            entity_state = self._learning_state[entity_id] = EntityLearning(
+                last_event=now
+            )
+            self._by_health.setdefault(HEALTH_UNKNOWN, set()).add(entity_id)
+
         # Calculate interval
-        if entity_state["last_event"] is not None:
-            interval = now - entity_state["last_event"]
-            
-            # Update EWMA
-            old_ewma = entity_state.get("interval_ewma")
+        if entity_state.last_event is not None:
+            interval = now - entity_state.last_event
+
+            # Update EWMA and exponentially weighted variance (Welford
+            # style incremental form — O(1), numerically stable)
+            old_ewma = entity_state.interval_ewma
             alpha = 0.3  # Smoothing factor
             if old_ewma is None:
-                entity_state["interval_ewma"] = interval
+                entity_state.interval_ewma = interval
+                entity_state.interval_variance = 0.0
             else:
-                entity_state["interval_ewma"] = (
-                    (1 - alpha) * old_ewma + alpha * interval
+                delta = interval - old_ewma
+                entity_state.interval_ewma = old_ewma + alpha * delta
+                entity_state.interval_variance = (1 - alpha) * (
+                    entity_state.interval_variance + alpha * delta * delta
                 )
-            
-            # MODE-AWARE: Get threshold multiplier from current mode
-            threshold_multiplier = await self._get_current_threshold_multiplier()
-            entity_state["threshold"] = entity_state["interval_ewma"] * threshold_multiplier
-            
-            # Store in history (keep last 100)
-            entity_state["history"].append({
-                "timestamp": now,
-                "interval": interval,
-                "state": state.state
-            })
-            if len(entity_state["history"]) > 100:
-                entity_state["history"] = entity_state["history"][-100:]
-        
-        entity_state["last_event"] = now
-        entity_state["event_count"] += 1
+
+            # MODE-AWARE: once the variance estimate has data the
+            # threshold adapts to observed jitter (mean + k*stddev,
+            # floored so it can never dip below 1.1x the mean); early
+            # on, the plain multiplier avoids over-tightening from a
+            # handful of samples
+            ewma = entity_state.interval_ewma
+            if entity_state.event_count >= 5:
+                entity_state.threshold = max(
+                    ewma * 1.1,
+                    ewma + self._threshold_multiplier
+                    * sqrt(entity_state.interval_variance),
+                )
+            else:
+                entity_state.threshold = ewma * self._threshold_multiplier
+
+            # Store in history: bounded deque of (timestamp, interval,
+            # state) tuples — no per-record dict, no slice-and-copy
+            entity_state.history.append((now, interval, state.state))
+
+        entity_state.last_event = now
+        entity_state.event_count += 1
+        # New event: the cached health verdict is no longer valid
+        entity_state.health_valid_until = None
         
         # v0.7: Extract technical context (battery, LQI, RSSI)
-        await self._extract_technical_context(entity_id, state, entity_state)
+        self._extract_technical_context(entity_id, state, entity_state, now)
         
         # Evaluate health
-        old_health = entity_state.get("last_health")
+        old_health = entity_state.last_health
         new_health = self._evaluate_health(entity_id)
-        entity_state["last_health"] = new_health
+        # _evaluate_health indexes classified verdicts itself; this
+        # extra pass is idempotent and covers the UNKNOWN early-returns
+        self._index_health(entity_id, old_health, new_health)
+        entity_state.last_health = new_health
         
         # Fire event if health changed (MEJORA #5)
         if old_health != new_health:
             self._recorder.fire_health_changed_event(
-                entity_id, old_health, new_health, entity_state
+                entity_id,
+                old_health,
+                new_health,
+                {
+                    "interval_ewma": entity_state.interval_ewma,
+                    "threshold": entity_state.threshold,
+                    "event_count": entity_state.event_count,
+                    "technical_context": entity_state.technical_context,
+                },
             )
 
         # Fire learned event at 10 events (sufficient data)
-        if entity_state["event_count"] == 10:
+        if entity_state.event_count == 10:
             self._recorder.fire_entity_learned_event(
                 entity_id,
-                entity_state["interval_ewma"],
-                entity_state["event_count"]
+                entity_state.interval_ewma,
+                entity_state.event_count
             )
         # Track changed entity
         self._entities_changed.add(entity_id)
@@ -184,153 +332,238 @@ class LSGEvaluator:
                 entity_id,
                 new_health
             )
-            await self._async_schedule_save(priority=True)
+            self._schedule_save(priority=True)
         else:
-            await self._async_schedule_save(priority=False)
+            self._schedule_save(priority=False)
     
-    async def _get_current_threshold_multiplier(self) -> float:
-        """Get threshold multiplier based on current mode (MODE-AWARE)."""
+    @callback
+    def async_add_transition_listener(
+        self, listener: Callable[[str, str, str], None]
+    ) -> Callable[[], None]:
+        """Register a callback fired as (entity_id, old, new) on every
+        health transition. Returns an unsubscribe function.
+        """
+        self._transition_listeners.append(listener)
+
+        @callback
+        def _remove() -> None:
+            if listener in self._transition_listeners:
+                self._transition_listeners.remove(listener)
+
+        return _remove
+
+    @callback
+    def _index_health(self, entity_id: str, old: str, new: str) -> None:
+        """Move an entity between health index buckets (idempotent).
+
+        Every real verdict change funnels through here, so transition
+        listeners are notified from this one choke point; the
+        membership check keeps repeated calls for the same transition
+        from firing them twice.
+        """
+        if old == new:
+            return
+        new_bucket = self._by_health.setdefault(new, set())
+        if entity_id in new_bucket:
+            return
+        old_bucket = self._by_health.get(old)
+        if old_bucket is not None:
+            old_bucket.discard(entity_id)
+        new_bucket.add(entity_id)
+        for listener in self._transition_listeners:
+            listener(entity_id, old, new)
+
+    @callback
+    def _rebuild_health_index(self) -> None:
+        """Rebuild the health index from scratch (after a bulk load)."""
+        by_health: Dict[str, Set[str]] = {}
+        for entity_id, state in self._learning_state.items():
+            by_health.setdefault(state.last_health, set()).add(entity_id)
+        self._by_health = by_health
+
+    def get_entities_by_health(self, status: str) -> Set[str]:
+        """Get the ids of entities currently in the given health status.
+
+        Returns a fresh set (safe to iterate across awaits), filtered
+        against the live learning state so externally reset entities
+        don't linger.
+        """
+        bucket = self._by_health.get(status)
+        if not bucket:
+            return set()
+        learning = self._learning_state
+        return {eid for eid in bucket if eid in learning}
+
+    @callback
+    def refresh_mode_cache(self) -> None:
+        """Re-read the current mode and threshold multiplier from storage.
+
+        Called at setup and whenever the mode changes (service or
+        websocket); the hot path then uses the cached attributes.
+        """
         try:
-            config = await self._storage.async_get("config")
+            config = self._storage.get_cached("config")
             current_mode = config.get("modes", {}).get("current", "normal")
             mode_config = MODE_CONFIGS.get(current_mode, MODE_CONFIGS["normal"])
-            return mode_config["threshold_multiplier"]
+            self._current_mode = current_mode
+            self._threshold_multiplier = mode_config.threshold_multiplier
         except Exception as e:
             _LOGGER.warning("Could not get mode config: %s, using default", e)
-            return 2.5
+            self._current_mode = "normal"
+            self._threshold_multiplier = 2.5
     
-    async def _extract_technical_context(
-        self, entity_id: str, state: State, entity_state: Dict
+    @callback
+    def _extract_technical_context(
+        self, entity_id: str, state: State, entity_state: EntityLearning, now: float
     ) -> None:
         """
         Extract technical context from entity state (v0.7).
-        
+
         Monitors:
         - Battery level
         - LQI (Zigbee Link Quality Indicator)
         - RSSI (WiFi/BLE Received Signal Strength Indicator)
+
+        Args:
+            now: Event timestamp, shared with the caller instead of
+                re-reading the clock for each *_timestamp field.
         """
-        context = entity_state.setdefault("technical_context", {})
-        
-        # Battery monitoring
-        battery_level = None
-        if hasattr(state, "attributes"):
-            # Try common battery attributes
-            battery_level = (
-                state.attributes.get("battery_level") or
-                state.attributes.get("battery") or
-                state.attributes.get("battery_percent")
-            )
-            
-            # If entity_id contains 'battery', use state value
-            if battery_level is None and "battery" in entity_id.lower():
-                try:
-                    battery_level = float(state.state)
-                except (ValueError, TypeError):
-                    pass
-        
+        # technical_context is guaranteed at entity init and on load
+        context = entity_state.technical_context
+
+        # State objects always carry attributes; bind the dict once
+        attrs = state.attributes
+
+        # Battery monitoring: first matching attribute wins
+        battery_level = next(
+            (attrs[k] for k in _BATTERY_KEYS if k in attrs), None
+        )
+
+        # If entity_id contains 'battery', use state value (entity ids
+        # are always lowercase)
+        if battery_level is None and "battery" in entity_id:
+            battery_level = state.state
+
+        battery_level = _to_float(battery_level)
         if battery_level is not None:
-            try:
-                battery_level = float(battery_level)
-                context["battery_level"] = battery_level
-                context["battery_timestamp"] = time.time()
-                
-                # Classify battery status
-                if battery_level <= BATTERY_CRITICAL_THRESHOLD:
-                    context["battery_status"] = "critical"
-                elif battery_level <= BATTERY_LOW_THRESHOLD:
-                    context["battery_status"] = "low"
-                else:
-                    context["battery_status"] = "ok"
-            except (ValueError, TypeError):
-                pass
-        
+            context["battery_level"] = battery_level
+            context["battery_timestamp"] = now
+
+            # Classify battery status
+            if battery_level <= BATTERY_CRITICAL_THRESHOLD:
+                context["battery_status"] = "critical"
+            elif battery_level <= BATTERY_LOW_THRESHOLD:
+                context["battery_status"] = "low"
+            else:
+                context["battery_status"] = "ok"
+
         # LQI monitoring (Zigbee)
-        if hasattr(state, "attributes"):
-            lqi = state.attributes.get("lqi") or state.attributes.get("linkquality")
-            if lqi is not None:
-                try:
-                    lqi = int(lqi)
-                    context["lqi"] = lqi
-                    context["lqi_timestamp"] = time.time()
-                    context["lqi_status"] = "low" if lqi < LQI_LOW_THRESHOLD else "ok"
-                except (ValueError, TypeError):
-                    pass
-        
+        lqi = _to_int(next(
+            (attrs[k] for k in _LQI_KEYS if k in attrs), None
+        ))
+        if lqi is not None:
+            context["lqi"] = lqi
+            context["lqi_timestamp"] = now
+            context["lqi_status"] = "low" if lqi < LQI_LOW_THRESHOLD else "ok"
+
         # RSSI monitoring (WiFi/BLE)
-        if hasattr(state, "attributes"):
-            rssi = state.attributes.get("rssi") or state.attributes.get("signal_strength")
-            if rssi is not None:
-                try:
-                    rssi = int(rssi)
-                    context["rssi"] = rssi
-                    context["rssi_timestamp"] = time.time()
-                    context["rssi_status"] = "low" if rssi < RSSI_LOW_THRESHOLD else "ok"
-                except (ValueError, TypeError):
-                    pass
+        rssi = _to_int(next(
+            (attrs[k] for k in _RSSI_KEYS if k in attrs), None
+        ))
+        if rssi is not None:
+            context["rssi"] = rssi
+            context["rssi_timestamp"] = now
+            context["rssi_status"] = "low" if rssi < RSSI_LOW_THRESHOLD else "ok"
     
-    async def _async_schedule_save(self, priority: bool = False) -> None:
-        """Schedule a debounced save operation."""
-        # Cancel existing save task if any
-        if self._save_task and not self._save_task.done():
-            self._save_task.cancel()
-        
-        # Determine delay
-        if priority:
-            delay = 5  # Priority saves happen in 5 seconds
-        else:
-            delay = SAVE_DEBOUNCE_SECONDS
-        
-        # Create new save task
-        async def _delayed_save():
-            try:
-                await asyncio.sleep(delay)
-                await self._async_save_learning_state()
-            except asyncio.CancelledError:
-                _LOGGER.debug("Save task cancelled (newer save scheduled)")
-            except Exception as e:
-                _LOGGER.exception("Error in delayed save: %s", e)
-        
-        self._save_task = self._hass.async_create_task(_delayed_save())
+    @callback
+    def _schedule_save(self, priority: bool = False) -> None:
+        """Schedule a debounced save operation.
+
+        Uses a single loop TimerHandle instead of spawning (and
+        cancelling) a sleeping task per state-change event. A max-wait
+        invariant is enforced inline: under continuous churn the delay
+        shrinks so a save lands at most SAVE_MAX_WAIT_SECONDS after the
+        first unsaved change, instead of being rescheduled forever.
+        """
+        if self._save_timer is not None:
+            self._save_timer.cancel()
+
+        now = time.time()
+        if self._first_dirty_at == 0:
+            self._first_dirty_at = now
+
+        # Priority saves happen in 5 seconds
+        requested = 5 if priority else SAVE_DEBOUNCE_SECONDS
+        delay = min(
+            requested,
+            max(0, self._first_dirty_at + SAVE_MAX_WAIT_SECONDS - now),
+        )
+
+        self._save_timer = self._hass.loop.call_later(
+            delay, self._fire_scheduled_save
+        )
         self._pending_save = True
-    
-    async def _async_periodic_save(self, now=None) -> None:
-        """Periodic forced save (called every SAVE_MAX_WAIT_SECONDS)."""
-        elapsed = time.time() - self._last_save_time
-        
-        if self._entities_changed and elapsed >= SAVE_MAX_WAIT_SECONDS:
-            _LOGGER.debug(
-                "Forcing periodic save (%d entities changed in last %d seconds)",
-                len(self._entities_changed),
-                int(elapsed)
-            )
-            await self._async_save_learning_state()
-        
-        # Also cleanup expired cache entries
+
+    @callback
+    def _fire_scheduled_save(self) -> None:
+        """Timer callback: run the actual save as a task.
+
+        Also sweeps expired health-cache entries — piggybacking on save
+        activity means zero timer wakeups while the system is idle, and
+        reads expire stale entries on their own anyway.
+        """
+        self._save_timer = None
         self._health_cache.cleanup_expired()
-    
-    def _evaluate_health(self, entity_id: str) -> str:
-        """Evaluate health status based on learning."""
+        self._hass.async_create_task(self._async_save_learning_state())
+
+    def _evaluate_health(self, entity_id: str, now: Optional[float] = None) -> str:
+        """Evaluate health status based on learning.
+
+        Args:
+            entity_id: Entity to classify.
+            now: Reference timestamp; batch callers pass one shared
+                value instead of re-fetching the clock per entity.
+        """
         state = self._learning_state.get(entity_id)
-        
-        if not state or state.get("event_count", 0) < 2:
+
+        if state is None or state.event_count < 2:
             return HEALTH_UNKNOWN
-        
-        now = time.time()
-        last_event = state.get("last_event", now)
+
+        if now is None:
+            now = time.time()
+
+        # Short-circuit: the verdict cannot change before the next
+        # threshold boundary, so skip the math until then
+        valid_until = state.health_valid_until
+        if valid_until is not None and now < valid_until:
+            return state.last_health
+
+        last_event = state.last_event
         interval = now - last_event
-        threshold = state.get("threshold")
-        
+        threshold = state.threshold
+
         if threshold is None or threshold <= 0:
             return HEALTH_UNKNOWN
-        
-        # Health classification (mode-aware threshold already applied)
+
+        # Health classification (mode-aware threshold already applied);
+        # record when the current verdict expires (STALE is terminal
+        # until a new event invalidates, so it is not time-bounded)
         if interval < threshold * 1.1:
-            return HEALTH_OK
+            health = HEALTH_OK
+            state.health_valid_until = last_event + threshold * 1.1
         elif interval < threshold * 2.0:
-            return HEALTH_LATE
+            health = HEALTH_LATE
+            state.health_valid_until = last_event + threshold * 2.0
         else:
-            return HEALTH_STALE
+            health = HEALTH_STALE
+            state.health_valid_until = None
+
+        # Keep last_health (and the status index) in sync so the
+        # short-circuit path above always returns the verdict that set
+        # health_valid_until
+        self._index_health(entity_id, state.last_health, health)
+        state.last_health = health
+        return health
     
     def get_diagnostic_context(self, entity_id: str) -> Dict[str, any]:
         """
@@ -342,7 +575,7 @@ class LSGEvaluator:
         if not state:
             return {"diagnosis": "no_data"}
         
-        context = state.get("technical_context", {})
+        context = state.technical_context
         health = self._evaluate_health(entity_id)
         
         diagnosis = {
@@ -379,60 +612,136 @@ class LSGEvaluator:
         return diagnosis
     
     async def async_run_evaluation(self) -> Dict[str, str]:
-        """Run full evaluation of all tracked entities."""
+        """Run full evaluation of all tracked entities.
+
+        The classification is inlined here as one batch pass: a single
+        clock read and plain comparisons per entity, instead of a
+        method call (and time.time()) per entity.
+        """
+        now = time.time()
+        cache_now = time.monotonic()
         results = {}
-        
+        cache_set = self._health_cache.set
+
         for entity_id, state in self._learning_state.items():
-            health = self._evaluate_health(entity_id)
+            valid_until = state.health_valid_until
+            if valid_until is not None and now < valid_until:
+                # Verdict cannot have changed before its boundary
+                health = state.last_health
+            else:
+                threshold = state.threshold
+                if state.event_count < 2 or not threshold or threshold <= 0:
+                    health = HEALTH_UNKNOWN
+                else:
+                    last_event = state.last_event
+                    interval = now - last_event
+                    if interval < threshold * 1.1:
+                        health = HEALTH_OK
+                        state.health_valid_until = last_event + threshold * 1.1
+                    elif interval < threshold * 2.0:
+                        health = HEALTH_LATE
+                        state.health_valid_until = last_event + threshold * 2.0
+                    else:
+                        health = HEALTH_STALE
+                        state.health_valid_until = None
+
             results[entity_id] = health
-            state["last_health"] = health
-            
-            # Update cache
-            self._health_cache.set(entity_id, health)
-        
+            old_health = state.last_health
+            if old_health != health:
+                self._index_health(entity_id, old_health, health)
+                state.last_health = health
+            cache_set(entity_id, health, cache_now)
+
         _LOGGER.debug("Evaluation complete: %d entities", len(results))
-        
+
+        # Sweep the cache's expiry heap here as well: saves (the other
+        # sweep trigger) are event-driven, so on a quiet installation
+        # these periodic cache_set calls would otherwise grow the heap
+        # without anything ever draining it
+        self._health_cache.cleanup_expired()
+
         # Log cache stats
         cache_stats = self._health_cache.get_stats()
         _LOGGER.debug("Cache stats: %s", cache_stats)
         
         return results
     
-    async def _async_save_learning_state(self) -> None:
-        """Persist learning state to storage with validation."""
+    async def _async_save_learning_state(self, full: bool = False) -> None:
+        """Persist learning state to storage with validation.
+
+        Only entities flagged in ``_entities_changed`` are serialized
+        and merged into the stored blob, so a debounced save is
+        O(changed entities) instead of O(all entities). ``full=True``
+        (used on unload) writes everything.
+        """
         if not self._storage:
             return
-        
+
+        changed_ids: Tuple[str, ...] = ()
         try:
-            # Validate before saving
-            is_valid, message, cleaned_state = DataValidator.validate_learning_state(
-                self._learning_state
-            )
-            
+            if full:
+                changed_ids = tuple(self._learning_state)
+            else:
+                changed_ids = tuple(self._entities_changed)
+                if not changed_ids:
+                    self._pending_save = False
+                    return
+
+            # Serialize entity records to the stored dict shape; the
+            # validator (and JSON storage) work on that form
+            snapshot = {}
+            for entity_id in changed_ids:
+                state = self._learning_state.get(entity_id)
+                if state is not None:
+                    snapshot[entity_id] = state.to_dict()
+
+            # Clear dirty flags before any await: events landing while
+            # the save is in flight re-mark their entity and get picked
+            # up by the next save instead of being un-dirtied below
+            self._entities_changed.difference_update(changed_ids)
+
+            # Validate before saving. The full pass (unload) can cover
+            # thousands of entities, so it runs in an executor thread;
+            # delta saves are O(changed) and stay inline
+            if full:
+                is_valid, message, cleaned_state = await self._hass.async_add_executor_job(
+                    DataValidator.validate_learning_state, snapshot
+                )
+            else:
+                is_valid, message, cleaned_state = DataValidator.validate_learning_state(
+                    snapshot
+                )
+
             if not is_valid:
                 _LOGGER.error("Learning state validation failed: %s", message)
+                self._entities_changed.update(changed_ids)
                 return
-            
-            # Update in-memory state with cleaned version
-            self._learning_state = cleaned_state
-            
-            # Save to storage
-            await self._storage.async_set("learning_state", self._learning_state)
-            
+
+            # Persist: full rewrite on unload, per-entity merge
+            # otherwise. The validator's cleanup applies to the stored
+            # payload only — live EntityLearning objects may have
+            # advanced while the write was in flight and must not be
+            # rolled back to this snapshot.
+            if full:
+                await self._storage.async_set("learning_state", cleaned_state)
+            else:
+                await self._storage.async_update("learning_state", cleaned_state)
+
             # Update tracking
             self._last_save_time = time.time()
-            changed_count = len(self._entities_changed)
-            self._entities_changed.clear()
+            self._first_dirty_at = 0.0
             self._pending_save = False
-            
+
             _LOGGER.debug(
                 "Learning state saved successfully (%d entities changed): %s",
-                changed_count,
+                len(changed_ids),
                 message
             )
-            
+
         except Exception as e:
             _LOGGER.exception("Error saving learning state: %s", e)
+            # Failed saves leave their entities dirty for the next pass
+            self._entities_changed.update(changed_ids)
     
     def get_entity_health(self, entity_id: str) -> str:
         """
@@ -451,24 +760,44 @@ class LSGEvaluator:
         
         return health
     
+    def get_event_count(self, entity_id: str) -> int:
+        """Get the observed event count for an entity (0 if unknown).
+
+        Cheap accessor for gating checks that don't need the full
+        stats dict.
+        """
+        state = self._learning_state.get(entity_id)
+        return state.event_count if state else 0
+
     def get_entity_stats(self, entity_id: str) -> Optional[Dict]:
         """Get learning statistics for entity."""
         state = self._learning_state.get(entity_id)
         if not state:
             return None
         
-        # Include diagnostic context (v0.7)
-        stats = dict(state)
+        # Include diagnostic context (v0.7); history goes out in the
+        # JSON-friendly list-of-dicts form
+        stats = state.to_dict()
         stats["diagnosis"] = self.get_diagnostic_context(entity_id)
-        
+
         return stats
     
     def get_all_health_states(self) -> Dict[str, str]:
         """Get health states for all entities (with cache optimization)."""
-        return {
-            eid: self.get_entity_health(eid)
-            for eid in self._learning_state.keys()
-        }
+        now = time.time()
+        cache_now = time.monotonic()
+        cache_get = self._health_cache.get
+        cache_set = self._health_cache.set
+        results = {}
+
+        for eid in self._learning_state:
+            health = cache_get(eid, cache_now)
+            if health is None:
+                health = self._evaluate_health(eid, now)
+                cache_set(eid, health, cache_now)
+            results[eid] = health
+
+        return results
     
     def get_cache_stats(self) -> Dict[str, any]:
         """Get health cache statistics."""
@@ -476,26 +805,19 @@ class LSGEvaluator:
     
     async def async_unload(self) -> None:
         """Cleanup and save state."""
-        # Cancel any pending save task
-        if self._save_task and not self._save_task.done():
-            self._save_task.cancel()
-            try:
-                await self._save_task
-            except asyncio.CancelledError:
-                pass
-        
-        # Force final save
-        await self._async_save_learning_state()
+        # Cancel any pending save timer
+        if self._save_timer is not None:
+            self._save_timer.cancel()
+            self._save_timer = None
+
+        # Force final full save
+        await self._async_save_learning_state(full=True)
         
         # Unsubscribe from events
         if self._unsubscribe:
             self._unsubscribe()
             self._unsubscribe = None
-        
-        if self._unsubscribe_timer:
-            self._unsubscribe_timer()
-            self._unsubscribe_timer = None
-        
+
         # Log final cache stats
         cache_stats = self._health_cache.get_stats()
         _LOGGER.info("Evaluator unloaded. Final cache stats: %s", cache_stats)
\ No newline at end of file
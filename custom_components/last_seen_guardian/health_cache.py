@@ -4,16 +4,21 @@ Caches health state calculations to reduce CPU usage.
 """
 from __future__ import annotations
 
+import heapq
 import logging
 import time
-from typing import Dict, Tuple, Optional
+from typing import Dict, List, Tuple, Optional
 from collections import OrderedDict
 
 _LOGGER = logging.getLogger(__name__)
 
 
 class HealthCache:
-    """LRU cache for health state calculations."""
+    """LRU cache for health state calculations.
+
+    Entry timestamps use time.monotonic(): they never leave the
+    process, and TTL math stays correct across wall-clock jumps.
+    """
     
     def __init__(self, ttl: int = 60, max_size: int = 1000):
         """
@@ -24,6 +29,9 @@ class HealthCache:
             max_size: Maximum number of entries in cache
         """
         self._cache: OrderedDict[str, Tuple[str, float]] = OrderedDict()
+        # Min-heap of (expiry, entity_id); may hold stale entries for
+        # re-set ids, validated against the live timestamp on pop
+        self._expiry: List[Tuple[float, str]] = []
         self._ttl = ttl
         self._max_size = max_size
         
@@ -32,59 +40,69 @@ class HealthCache:
         self._misses = 0
         self._evictions = 0
     
-    def get(self, entity_id: str) -> Optional[str]:
+    def get(self, entity_id: str, now: Optional[float] = None) -> Optional[str]:
         """
         Get cached health state for entity.
-        
+
         Args:
             entity_id: Entity to lookup
-        
+            now: Optional time.monotonic() reference; batch callers pass
+                one shared value instead of a clock read per lookup
+
         Returns:
             Cached health state or None if not found/expired
         """
-        if entity_id not in self._cache:
+        cache = self._cache
+        entry = cache.get(entity_id)
+        if entry is None:
             self._misses += 1
             return None
-        
-        health, timestamp = self._cache[entity_id]
-        
+
+        health, timestamp = entry
+
         # Check if expired
-        if time.time() - timestamp > self._ttl:
-            del self._cache[entity_id]
+        if now is None:
+            now = time.monotonic()
+        if now - timestamp > self._ttl:
+            del cache[entity_id]
             self._misses += 1
             return None
-        
+
         # Move to end (LRU)
-        self._cache.move_to_end(entity_id)
+        cache.move_to_end(entity_id)
         self._hits += 1
-        
+
         return health
     
-    def set(self, entity_id: str, health: str) -> None:
+    def set(self, entity_id: str, health: str, now: Optional[float] = None) -> None:
         """
         Cache health state for entity.
-        
+
         Args:
             entity_id: Entity ID
             health: Health state to cache
+            now: Optional time.monotonic() reference for batch callers
         """
-        now = time.time()
-        
+        if now is None:
+            now = time.monotonic()
+
         # If already exists, update and move to end
         if entity_id in self._cache:
             self._cache[entity_id] = (health, now)
             self._cache.move_to_end(entity_id)
+            heapq.heappush(self._expiry, (now + self._ttl, entity_id))
             return
-        
+
         # Check size limit
         if len(self._cache) >= self._max_size:
             # Remove oldest entry (LRU)
             oldest = next(iter(self._cache))
             del self._cache[oldest]
             self._evictions += 1
-        
+
         # Add new entry
         self._cache[entity_id] = (health, now)
+        heapq.heappush(self._expiry, (now + self._ttl, entity_id))
     
     def invalidate(self, entity_id: str) -> None:
         """
@@ -99,29 +117,46 @@ class HealthCache:
     def invalidate_all(self) -> None:
         """Clear entire cache."""
         self._cache.clear()
+        self._expiry.clear()
         _LOGGER.debug("Health cache cleared")
-    
+
     def cleanup_expired(self) -> int:
         """
         Remove expired entries from cache.
-        
+
+        Pops the expiry heap instead of scanning every entry, so the
+        cost is O(k log N) for k actually-expired (or superseded)
+        heap records rather than O(N) per call.
+
         Returns:
             Number of entries removed
         """
-        now = time.time()
-        expired = []
-        
-        for entity_id, (health, timestamp) in self._cache.items():
-            if now - timestamp > self._ttl:
-                expired.append(entity_id)
-        
-        for entity_id in expired:
-            del self._cache[entity_id]
-        
-        if expired:
-            _LOGGER.debug("Removed %d expired cache entries", len(expired))
-        
-        return len(expired)
+        now = time.monotonic()
+        expiry = self._expiry
+        cache = self._cache
+        removed = 0
+
+        while expiry and expiry[0][0] <= now:
+            _, entity_id = heapq.heappop(expiry)
+            entry = cache.get(entity_id)
+            # Skip heap records superseded by a later set()
+            if entry is not None and now - entry[1] > self._ttl:
+                del cache[entity_id]
+                removed += 1
+
+        # Superseded records (re-set entities, expired get()s,
+        # invalidate()) are only dropped when their old expiry passes;
+        # if they ever dominate, rebuild the heap from live entries so
+        # it cannot outgrow the cache unboundedly
+        if len(expiry) > 64 and len(expiry) > 4 * len(cache):
+            fresh = [(ts + self._ttl, eid) for eid, (_, ts) in cache.items()]
+            heapq.heapify(fresh)
+            self._expiry = fresh
+
+        if removed:
+            _LOGGER.debug("Removed %d expired cache entries", removed)
+
+        return removed
     
     def get_stats(self) -> Dict[str, any]:
         """
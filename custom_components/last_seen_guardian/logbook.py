@@ -11,6 +11,18 @@ from homeassistant.core import Event, HomeAssistant, callback
 
 from .const import DOMAIN
 
+# Static icon/template dispatch per health state (avoids re-branching
+# for every described event)
+_HEALTH_DESCRIPTIONS = {
+    "stale": ("mdi:alert-circle", "{eid} became unresponsive (from {old})"),
+    "late": ("mdi:clock-alert", "{eid} is reporting late (from {old})"),
+    "ok": ("mdi:check-circle", "{eid} recovered to normal (from {old})"),
+}
+_HEALTH_DESCRIPTION_DEFAULT = (
+    "mdi:help-circle",
+    "{eid} health changed: {old} → {new}",
+)
+
 
 @callback
 def async_describe_events(
@@ -26,22 +38,15 @@ def async_describe_events(
         old_health = event.data.get("old_health", "unknown")
         new_health = event.data.get("new_health", "unknown")
         
-        if new_health == "stale":
-            icon = "mdi:alert-circle"
-            message = f"{entity_id} became unresponsive (from {old_health})"
-        elif new_health == "late":
-            icon = "mdi:clock-alert"
-            message = f"{entity_id} is reporting late (from {old_health})"
-        elif new_health == "ok":
-            icon = "mdi:check-circle"
-            message = f"{entity_id} recovered to normal (from {old_health})"
-        else:
-            icon = "mdi:help-circle"
-            message = f"{entity_id} health changed: {old_health} → {new_health}"
-        
+        icon, template = _HEALTH_DESCRIPTIONS.get(
+            new_health, _HEALTH_DESCRIPTION_DEFAULT
+        )
+
         return {
             LOGBOOK_ENTRY_NAME: "Last Seen Guardian",
-            LOGBOOK_ENTRY_MESSAGE: message,
+            LOGBOOK_ENTRY_MESSAGE: template.format(
+                eid=entity_id, old=old_health, new=new_health
+            ),
             "icon": icon,
         }
 
@@ -4,14 +4,15 @@ Smart alerts with throttling, mode awareness, and multi-channel support.
 """
 from __future__ import annotations
 
+import asyncio
+import bisect
 import logging
 import time
-from typing import Dict, Optional, List, Set
-from datetime import datetime
+from typing import Dict, Optional, List, Set, Tuple
+from datetime import timedelta
 
 from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.event import async_track_time_interval
-from datetime import timedelta
 
 from .const import (
     DOMAIN,
@@ -19,15 +20,48 @@ from .const import (
     HEALTH_LATE,
     DEFAULT_NOTIFY_SERVICE,
     NOTIFICATION_THROTTLE_SECONDS,
-    NOTIFICATION_COOLDOWN_SECONDS,
     MODE_CONFIGS,
 )
 
 _LOGGER = logging.getLogger(__name__)
 
+# Module-level bind: throttle bookkeeping calls this in the hot loop
+_monotonic = time.monotonic
+
 # CRITICAL: Minimum events before notifying
 MIN_EVENTS_FOR_NOTIFICATION = 10
 
+# Reactive trigger: STALE transitions coalesce for this long before one
+# notification pass runs, so a burst of failures yields a single cycle
+COALESCE_SECONDS = 2
+
+# Token-bucket rate limiting (lazy refill: tokens accrue at BUCKET_RATE
+# up to BUCKET_CAP, so throttle + burst handling is a single comparison)
+BUCKET_CAP = 3.0
+BUCKET_RATE = 1.0 / NOTIFICATION_THROTTLE_SECONDS
+# Global bucket replaces the old "max 3 per cycle" cap: 3 tokens,
+# refilled at one cycle's worth per 5-minute check interval
+GLOBAL_BUCKET_CAP = 3.0
+GLOBAL_BUCKET_RATE = 3.0 / 300.0
+# Drop buckets that refilled to capacity and sat idle for an hour
+BUCKET_IDLE_EVICT_SECONDS = 3600
+# Hard cap on tracked buckets: beyond this the stalest are dropped so
+# months of entity churn can't grow the dict without bound
+_MAX_BUCKETS = 4096
+
+# Severity label per health state (only STALE notifies today, but the
+# table keeps the lookup branch-free if LATE alerts are enabled later)
+_SEVERITY = {
+    HEALTH_STALE: "🔴 CRITICAL",
+    HEALTH_LATE: "🟡 WARNING",
+}
+
+# Pre-rendered notification fragments (built once at import, not per call)
+_TITLE_TEMPLATE = "🚨 LSG Alert: {}"
+# Shared by every silent notification; HA copies service call data, so
+# one module-level dict is safe to reuse
+_SILENT_DATA = {"priority": "low", "silent": True}
+
 
 class LSGNotificationManager:
     """Manages smart notifications with throttling and mode awareness."""
@@ -37,14 +71,26 @@ class LSGNotificationManager:
         self._hass = hass
         self._storage = None
         self._evaluator = None
-        
-        # Throttling state
-        self._notification_history: Dict[str, float] = {}
+
+        # Entry options applied in place (win over stored config)
+        self._options: Dict = {}
+
+        # Throttling state: per-entity token buckets (tokens, last_refill)
+        # plus one global bucket shared across all entities
+        self._buckets: Dict[str, Tuple[float, float]] = {}
+        self._global_bucket: Tuple[float, float] = (GLOBAL_BUCKET_CAP, 0.0)
         self._entities_in_alert: Set[str] = set()
         self._pending_notifications: List[Dict] = []
         
         # Unsub handlers
         self._unsub_check = None
+        self._unsub_transitions = None
+        self._pending_flush: Optional[asyncio.TimerHandle] = None
+
+        # Parsed (domain, service) memoized per notify target string,
+        # so the split runs once per target instead of per notification
+        self._notify_parts_src: Optional[str] = None
+        self._notify_parts: Tuple[str, str] = ("notify", "notify")
         
         # Statistics
         self._stats = {
@@ -54,44 +100,79 @@ class LSGNotificationManager:
             "total_suppressed_by_learning": 0,
         }
         
-        # Startup grace period (don't notify for first 10 minutes)
-        self._startup_time = time.time()
+        # Startup grace period (don't notify for first 10 minutes);
+        # monotonic so an NTP step can't shrink or stretch the window
+        self._startup_time = _monotonic()
         self._startup_grace_period = 600  # 10 minutes
     
     async def async_setup(self) -> None:
-        """Initialize notification manager."""
+        """Initialize notification manager.
+
+        Config is always read live through the storage layer's
+        in-memory view, so no setup-time snapshot is taken.
+        """
         self._storage = self._hass.data[DOMAIN].get("storage")
         self._evaluator = self._hass.data[DOMAIN].get("evaluator")
         
-        # CRITICAL FIX: Check every 5 minutes, not 1 minute
+        # Reactive path: the evaluator pushes health transitions, so a
+        # STALE entity triggers a (coalesced) pass within seconds
+        if self._evaluator:
+            self._unsub_transitions = self._evaluator.async_add_transition_listener(
+                self._on_health_transition
+            )
+
+        # Periodic pass kept only as a long-interval safety net for
+        # state that went stale without any transition being pushed
         self._unsub_check = async_track_time_interval(
             self._hass,
             self._async_process_notifications,
-            timedelta(minutes=5)  # Changed from 1 to 5
+            timedelta(minutes=15)
         )
-        
+
         _LOGGER.info("Notification manager initialized (startup grace: %ds)", 
                     self._startup_grace_period)
     
+    @callback
+    def _on_health_transition(self, entity_id: str, old: str, new: str) -> None:
+        """Schedule a coalesced notification pass when an entity goes STALE."""
+        if new != HEALTH_STALE or self._pending_flush is not None:
+            return
+        self._pending_flush = self._hass.loop.call_later(
+            COALESCE_SECONDS, self._flush_pending
+        )
+
+    @callback
+    def _flush_pending(self) -> None:
+        """Timer callback: run the notification pass as a task."""
+        self._pending_flush = None
+        self._hass.async_create_task(self._async_process_notifications())
+
     async def _async_process_notifications(self, now=None) -> None:
         """Process pending notifications with throttling and mode awareness."""
-        if not self._evaluator or not self._storage:
-            return
-        
-        # CRITICAL FIX: Don't send notifications during startup
-        if time.time() - self._startup_time < self._startup_grace_period:
+        # One monotonic read per cycle for all elapsed-time bookkeeping
+        # (grace window, bucket refills) — immune to wall-clock jumps.
+        # time.time() is read separately, and only when something is
+        # actually sent, for the user-visible "last seen" formatting.
+        current_time = _monotonic()
+
+        # CRITICAL FIX: Don't send notifications during startup — the
+        # cheapest predicate rejects the whole cycle first
+        if current_time - self._startup_time < self._startup_grace_period:
             _LOGGER.debug("Still in startup grace period, skipping notifications")
             return
-        
-        # Get configuration
-        try:
-            config = await self._storage.async_get("config")
-        except Exception as e:
-            _LOGGER.error("Could not load config: %s", e)
+
+        if not self._evaluator or not self._storage:
             return
+
+        # Get configuration (in-memory read, no await per tick)
+        config = self._storage.get_cached("config")
         
-        # Check if notifications are enabled globally
-        if not config.get("global", {}).get("enable_notifications", True):
+        # Check if notifications are enabled globally (entry options win)
+        enabled = self._options.get(
+            "enable_notifications",
+            config.get("global", {}).get("enable_notifications", True)
+        )
+        if not enabled:
             _LOGGER.debug("Notifications disabled globally")
             return
         
@@ -100,58 +181,123 @@ class LSGNotificationManager:
         mode_config = MODE_CONFIGS.get(current_mode, MODE_CONFIGS["normal"])
         
         # Check if alerts are enabled for current mode
-        if not mode_config.get("alert_enabled", True):
+        if not mode_config.alert_enabled:
             self._stats["total_suppressed_by_mode"] += 1
             _LOGGER.debug("Alerts disabled for mode: %s", current_mode)
             return
         
         # Get silent mode status
-        silent = mode_config.get("silent_alerts", False)
+        silent = mode_config.silent_alerts
         
-        # Get all health states
-        health_states = self._evaluator.get_all_health_states()
+        # Refresh verdicts once (O(N), mostly boundary-cache hits),
+        # then walk only the entities currently STALE via the index —
+        # the per-entity gating below runs O(alerting), not O(total)
+        await self._evaluator.async_run_evaluation()
+        stale_entities = self._evaluator.get_entities_by_health(HEALTH_STALE)
         
-        current_time = time.time()
         notifications_sent = 0
         notifications_suppressed = 0
-        
-        for entity_id, health in health_states.items():
-            # Only notify for STALE (not LATE to reduce noise)
-            if health != HEALTH_STALE:
+        to_send: List[Tuple[str, Dict]] = []
+
+        # Lazy-refill the global bucket once per cycle
+        g_tokens, g_last = self._global_bucket
+        g_tokens = min(
+            GLOBAL_BUCKET_CAP, g_tokens + (current_time - g_last) * GLOBAL_BUCKET_RATE
+        )
+
+        # Hoist attribute lookups out of the loop: each name below is a
+        # LOAD_FAST per iteration instead of LOAD_ATTR + dict lookups
+        buckets = self._buckets
+        stat_counts = self._stats
+        get_event_count = self._evaluator.get_event_count
+        alerted_add = self._entities_in_alert.add
+
+        # Only STALE entities notify (not LATE, to reduce noise)
+        for entity_id in stale_entities:
+            # Cheap gates first — token buckets and learning count are
+            # dict/attribute reads; the full stats dict is only built
+            # for entities that will actually notify
+            tokens, last = buckets.get(entity_id, (BUCKET_CAP, current_time))
+            tokens = min(BUCKET_CAP, tokens + (current_time - last) * BUCKET_RATE)
+            buckets[entity_id] = (tokens, current_time)
+            if tokens < 1.0:
+                notifications_suppressed += 1
+                stat_counts["total_throttled"] += 1
                 continue
-            
-            # CRITICAL FIX: Check if entity has enough learning data
-            stats = self._evaluator.get_entity_stats(entity_id)
-            if not stats or stats.get("event_count", 0) < MIN_EVENTS_FOR_NOTIFICATION:
+
+            # Global bucket bounds the overall burst (was "max 3/cycle")
+            if g_tokens < 1.0:
                 notifications_suppressed += 1
-                self._stats["total_suppressed_by_learning"] += 1
                 continue
-            
-            # Check throttling
-            last_notified = self._notification_history.get(entity_id, 0)
-            time_since_last = current_time - last_notified
-            
-            if time_since_last < NOTIFICATION_THROTTLE_SECONDS:
+
+            # CRITICAL FIX: Check if entity has enough learning data
+            if get_event_count(entity_id) < MIN_EVENTS_FOR_NOTIFICATION:
                 notifications_suppressed += 1
-                self._stats["total_throttled"] += 1
+                stat_counts["total_suppressed_by_learning"] += 1
                 continue
-            
-            # Respect cooldown between different alerts
-            if notifications_sent > 0:
-                # Only send max 3 notifications per cycle
-                if notifications_sent >= 3:
-                    notifications_suppressed += 1
-                    continue
-            
-            # Send notification
-            await self._async_send_notification(
-                entity_id, health, silent, stats
+
+            # Admitted: consume tokens now, send as one batch below
+            stats = self._evaluator.get_entity_stats(entity_id)
+            g_tokens -= 1.0
+            buckets[entity_id] = (tokens - 1.0, current_time)
+            alerted_add(entity_id)
+            to_send.append((entity_id, stats))
+
+        self._global_bucket = (g_tokens, current_time)
+
+        if to_send:
+            # Resolve the notify service once for the whole batch
+            # (entry options win over stored config)
+            notify_service = self._options.get("notify_target")
+            if notify_service is None:
+                notify_service = config.get("global", {}).get(
+                    "notify_target", DEFAULT_NOTIFY_SERVICE
+                )
+
+            # Overlap the service round-trips instead of awaiting each
+            # notification before starting the next
+            now_wall = time.time()
+            await asyncio.gather(
+                *(
+                    self._async_send_notification(
+                        entity_id,
+                        HEALTH_STALE,
+                        silent,
+                        stats,
+                        now=now_wall,
+                        notify_service=notify_service,
+                    )
+                    for entity_id, stats in to_send
+                ),
+                return_exceptions=True,
             )
-            
-            self._notification_history[entity_id] = current_time
-            self._entities_in_alert.add(entity_id)
-            notifications_sent += 1
-        
+            notifications_sent = len(to_send)
+
+        # Bound memory: drop buckets that are back at capacity and idle
+        if self._buckets:
+            idle_cutoff = current_time - BUCKET_IDLE_EVICT_SECONDS
+            full = [
+                eid
+                for eid, (tokens, last) in self._buckets.items()
+                if last < idle_cutoff
+                and tokens + (current_time - last) * BUCKET_RATE >= BUCKET_CAP
+            ]
+            for eid in full:
+                del self._buckets[eid]
+
+            # Rare overflow path: drop the longest-untouched buckets
+            overflow = len(self._buckets) - _MAX_BUCKETS
+            if overflow > 0:
+                oldest = sorted(
+                    self._buckets.items(), key=lambda kv: kv[1][1]
+                )[:overflow]
+                for eid, _ in oldest:
+                    del self._buckets[eid]
+
+        # Keep the alert set meaning "currently alerting": entities
+        # that recovered since the last cycle drop out here
+        self._entities_in_alert &= stale_entities
+
         if notifications_sent > 0 or notifications_suppressed > 0:
             _LOGGER.info(
                 "Notification cycle complete: %d sent, %d suppressed",
@@ -164,43 +310,51 @@ class LSGNotificationManager:
         entity_id: str, 
         health: str, 
         silent: bool = False,
-        stats: Dict = None
+        stats: Dict = None,
+        now: Optional[float] = None,
+        notify_service: Optional[str] = None,
     ) -> None:
-        """Send notification for entity health issue."""
+        """Send notification for entity health issue.
+
+        ``now`` lets the cycle loop share one clock read across all
+        notifications instead of re-reading time.time() per entity;
+        ``notify_service`` is likewise resolved once per batch.
+        """
         try:
             diagnosis = self._evaluator.get_diagnostic_context(entity_id) if stats else {}
             
             # Build notification message
-            title = f"🚨 LSG Alert: {entity_id}"
-            
-            severity = "🔴 CRITICAL"
-            
-            # Format message
-            message_parts = [
-                f"{severity} - Entity not responding",
-                ""
-            ]
-            
-            # Add last seen info
+            title = _TITLE_TEMPLATE.format(entity_id)
+
+            severity = _SEVERITY.get(health, "🔴 CRITICAL")
+
+            # Format message: optional blocks pre-rendered, one f-string
+            last_seen_block = ""
             if stats and "last_event" in stats:
-                last_seen = _format_relative_time(stats["last_event"])
-                message_parts.append(f"⏱ Last seen: {last_seen}")
-            
+                last_seen = _format_relative_time(stats["last_event"], now)
+                last_seen_block = f"\n⏱ Last seen: {last_seen}"
+
             # Add ONE recommendation
-            if diagnosis and "recommendations" in diagnosis:
-                recommendations = diagnosis.get("recommendations", [])
-                if recommendations:
-                    message_parts.append("")
-                    message_parts.append(f"💡 {recommendations[0]}")
-            
-            message = "\n".join(message_parts)
-            
-            # Get notification service
-            config = await self._storage.async_get("config")
-            notify_service = config.get("global", {}).get(
-                "notify_target", DEFAULT_NOTIFY_SERVICE
+            rec_block = ""
+            recommendations = diagnosis.get("recommendations") if diagnosis else None
+            if recommendations:
+                rec_block = f"\n\n💡 {recommendations[0]}"
+
+            message = (
+                f"{severity} - Entity not responding\n"
+                f"{last_seen_block}{rec_block}"
             )
             
+            # Get notification service unless the batch resolved it
+            # already (entry options win over stored config)
+            if notify_service is None:
+                notify_service = self._options.get("notify_target")
+            if notify_service is None:
+                config = self._storage.get_cached("config")
+                notify_service = config.get("global", {}).get(
+                    "notify_target", DEFAULT_NOTIFY_SERVICE
+                )
+            
             # Prepare notification data
             data = {
                 "title": title,
@@ -208,10 +362,15 @@ class LSGNotificationManager:
             }
             
             if silent:
-                data["data"] = {"priority": "low", "silent": True}
+                data["data"] = _SILENT_DATA
             
-            # Send notification
-            domain, service = notify_service.split(".", 1)
+            # Send notification (split memoized per target string)
+            if notify_service == self._notify_parts_src:
+                domain, service = self._notify_parts
+            else:
+                domain, service = notify_service.split(".", 1)
+                self._notify_parts_src = notify_service
+                self._notify_parts = (domain, service)
             await self._hass.services.async_call(
                 domain, service, data
             )
@@ -223,6 +382,11 @@ class LSGNotificationManager:
         except Exception as e:
             _LOGGER.exception("Error sending notification for %s: %s", entity_id, e)
     
+    def apply_options(self, options: Dict) -> None:
+        """Apply config-entry options in place (no full reload needed)."""
+        self._options = dict(options)
+        _LOGGER.debug("Notification options applied: %s", sorted(self._options))
+
     def get_stats(self) -> Dict[str, any]:
         """Get notification statistics."""
         return {
@@ -235,20 +399,43 @@ class LSGNotificationManager:
         if self._unsub_check:
             self._unsub_check()
             self._unsub_check = None
-        
+
+        if self._unsub_transitions:
+            self._unsub_transitions()
+            self._unsub_transitions = None
+
+        if self._pending_flush is not None:
+            self._pending_flush.cancel()
+            self._pending_flush = None
+
+        # Drop per-entity state and component refs so a reloaded entry
+        # doesn't keep the old manager's throttle state alive
+        self._buckets.clear()
+        self._entities_in_alert.clear()
+        self._pending_notifications.clear()
+        self._evaluator = None
+        self._storage = None
+
         _LOGGER.info("Notification manager unloaded")
 
 
-def _format_relative_time(timestamp: float) -> str:
-    """Format timestamp as relative time."""
-    now = time.time()
+# Relative-time buckets: upper bound per unit, matched by bisect
+_TIME_BUCKETS = (60, 3600, 86400)
+_TIME_FORMATS = (
+    (1, "Just now"),
+    (60, "{n} minutes ago"),
+    (3600, "{n} hours ago"),
+    (86400, "{n} days ago"),
+)
+
+
+def _format_relative_time(timestamp: float, now: Optional[float] = None) -> str:
+    """Format timestamp as relative time against ``now`` (time.time() if omitted)."""
+    if now is None:
+        now = time.time()
     diff = now - timestamp
-    
-    if diff < 60:
-        return "Just now"
-    elif diff < 3600:
-        return f"{int(diff / 60)} minutes ago"
-    elif diff < 86400:
-        return f"{int(diff / 3600)} hours ago"
-    else:
-        return f"{int(diff / 86400)} days ago"
\ No newline at end of file
+
+    divisor, template = _TIME_FORMATS[bisect.bisect_right(_TIME_BUCKETS, diff)]
+    if divisor == 1:
+        return template
+    return template.format(n=int(diff // divisor))
\ No newline at end of file
@@ -54,14 +54,18 @@ async def async_setup_services(hass: HomeAssistant) -> None:
             # Reset specific entity
             if entity_id in evaluator._learning_state:
                 del evaluator._learning_state[entity_id]
-                await evaluator._async_save_learning_state()
+                # Full rewrite: the delta save merges into the stored
+                # blob and can never remove a key
+                await evaluator._async_save_learning_state(full=True)
                 _LOGGER.info("Learning state reset for %s", entity_id)
             else:
                 _LOGGER.warning("Entity %s not found in learning state", entity_id)
         else:
             # Reset all
             evaluator._learning_state.clear()
-            await evaluator._async_save_learning_state()
+            # Full rewrite (see above); a delta save of an empty
+            # snapshot would be a no-op and resurrect everything
+            await evaluator._async_save_learning_state(full=True)
             _LOGGER.info("Learning state reset for all entities")
     
     async def handle_force_evaluation(call: ServiceCall) -> None:
@@ -164,7 +168,11 @@ async def async_setup_services(hass: HomeAssistant) -> None:
         await storage.async_update("config", {
             "modes": {"current": mode}
         })
-        
+
+        evaluator = hass.data[DOMAIN].get("evaluator")
+        if evaluator:
+            evaluator.refresh_mode_cache()
+
         _LOGGER.info("Mode changed to: %s", mode)
     
     async def handle_cleanup_data(call: ServiceCall) -> None:
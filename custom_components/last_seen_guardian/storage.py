@@ -76,6 +76,23 @@ class LSGStorage:
             return self._data.get(key, {})
         return self._data
     
+    def get_cached(self, key: Optional[str] = None) -> Any:
+        """
+        Synchronously read from the in-memory data (no I/O).
+
+        Hot paths (per-event callbacks) use this instead of async_get;
+        the data dict is always resident after async_load.
+
+        Args:
+            key: Optional key to retrieve. If None, returns all data.
+
+        Returns:
+            Data for the key or all data if key is None.
+        """
+        if key:
+            return self._data.get(key, {})
+        return self._data
+
     async def async_set(self, key: str, value: Any) -> None:
         """
         Update and persist a specific key (replaces entire value).
@@ -167,6 +184,10 @@ class LSGStorage:
         
         return result
     
+    async def async_unload(self) -> None:
+        """Persist any pending data before the integration unloads."""
+        await self.async_save()
+
     def get_stats(self) -> Dict[str, Any]:
         """
         Get storage statistics.
@@ -143,7 +143,11 @@ def async_setup_websocket(hass: HomeAssistant) -> None:
             
             # Use deep merge via async_update
             await storage.async_update("config", msg["config"])
-            
+
+            evaluator = hass.data[DOMAIN].get("evaluator")
+            if evaluator:
+                evaluator.refresh_mode_cache()
+
             _LOGGER.info("Configuration updated via WebSocket")
             connection.send_result(msg["id"], {"success": True})
             
@@ -179,7 +183,11 @@ def async_setup_websocket(hass: HomeAssistant) -> None:
             await storage.async_update("config", {
                 "modes": {"current": mode}
             })
-            
+
+            evaluator = hass.data[DOMAIN].get("evaluator")
+            if evaluator:
+                evaluator.refresh_mode_cache()
+
             _LOGGER.info("Mode changed to: %s", mode)
             connection.send_result(msg["id"], {"mode": mode, "success": True})
             